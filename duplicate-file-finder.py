@@ -26,12 +26,38 @@ import os
 import sys
 import hashlib
 import argparse
-from collections import defaultdict
+from collections import defaultdict, deque
+from array import array
+from contextlib import ExitStack
 import time
 import csv
 import json
 from datetime import datetime
 import fnmatch
+from functools import lru_cache, partial
+import re
+import mmap
+import socket
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def check_dependencies():
     missing_dependencies = []
@@ -55,32 +81,242 @@ def check_dependencies():
         print("\nAfter installing the dependencies, please run the script again.")
         sys.exit(1)
 
-def get_file_hash(filepath):
-    hasher = hashlib.md5()
+PREFIX_SIZE = 65536  # Bytes hashed before deciding whether a full hash is needed
+HASH_CHUNK_SIZE = 1024 * 1024  # Read size for full hashes
+MMAP_THRESHOLD = 1024 * 1024  # With --mmap, files at least this large are memory-mapped for hashing
+
+def new_hasher():
+    # Prefer BLAKE3 (SIMD, and multi-threaded on large buffers), then xxh3, and fall back to SHA-256
+    if blake3 is not None:
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.sha256()
+
+# Linux can SHA-256 a file descriptor in the kernel (AF_ALG); cleared the first time that fails.
+# The first kernel digest is checked against hashlib before the kernel path is trusted on its own.
+kernel_hash_available = sys.platform.startswith('linux') and hasattr(socket, 'AF_ALG')
+kernel_hash_verified = False
+SENDFILE_MAX = 0x7ffff000  # Linux transfers at most this many bytes per sendfile call
+
+def get_kernel_file_hash(fd, size):
+    # sendfile feeds the file to the kernel's hash (SHA-NI where present) without copying it through Python
+    global kernel_hash_available
+    try:
+        with socket.socket(socket.AF_ALG, socket.SOCK_SEQPACKET, 0) as alg:
+            alg.bind(('hash', 'sha256'))
+            op, _ = alg.accept()
+            with op:
+                if os.sendfile(op.fileno(), fd, 0, size) != size:
+                    return None  # A short transfer has already finalized the digest over part of the file
+                return op.recv(32).hex()
+    except OSError:
+        kernel_hash_available = False
+        return None
+
+def advise_file(fd, advice):
+    # Page-cache hints are best effort; posix_fadvise is missing on Windows and macOS
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+def hash_open_file(file, size, use_mmap=False):
+    hasher = new_hasher()
+    mapped = None
+    if use_mmap and size >= MMAP_THRESHOLD:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, OverflowError, ValueError):
+            pass  # Out of address space (32-bit builds, many large files at once); stream the file instead
+    if mapped is not None:
+        # Hand the whole mapping to the hasher in one call, without copying it into Python bytes.
+        # Opt-in only: if another process truncates the file while it is mapped, touching the missing
+        # pages raises SIGBUS and ends the run; get_file_hash only catches changes that don't fault.
+        with mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            hasher.update(mapped)
+    else:
+        # Unbuffered reads straight into one reusable buffer: no per-chunk allocation or extra copy
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        length = file.readinto(buf)
+        while length:
+            hasher.update(view[:length])
+            length = file.readinto(buf)
+    return hasher.hexdigest()
+
+def get_file_hash(filepath, use_mmap=False):
+    global kernel_hash_available, kernel_hash_verified
+    try:
+        with open(filepath, 'rb', buffering=0) as file:
+            advise_file(file.fileno(), 'POSIX_FADV_SEQUENTIAL')
+            before = os.fstat(file.fileno())
+            size = before.st_size
+            file_hash = None
+            if kernel_hash_available and 0 < size <= SENDFILE_MAX and blake3 is None and xxhash is None:
+                file_hash = get_kernel_file_hash(file.fileno(), size)
+            if file_hash is None or not kernel_hash_verified:
+                local_hash = hash_open_file(file, size, use_mmap)
+                if file_hash is not None:
+                    if file_hash == local_hash:
+                        kernel_hash_verified = True
+                    else:
+                        kernel_hash_available = False  # The kernel disagrees with hashlib; stop using it
+                file_hash = local_hash
+            after = os.fstat(file.fileno())
+            if (after.st_size, after.st_mtime_ns) != (size, before.st_mtime_ns):
+                print(f"File changed while hashing: {filepath}")
+                file_hash = None
+            # Drop the pages we just streamed so hashing doesn't evict the rest of the page cache
+            advise_file(file.fileno(), 'POSIX_FADV_DONTNEED')
+        return file_hash
+    except IOError:
+        print(f"Error reading file: {filepath}")
+        return None
+
+def read_chunk(file, view):
+    # Fill view unless EOF comes first; an unbuffered read may legitimately come back short before EOF
+    length = file.readinto(view)
+    while length and length < len(view):
+        more = file.readinto(view[length:])
+        if not more:
+            break
+        length += more
+    return length
+
+def files_equal(filepath_a, filepath_b):
+    # Byte-for-byte comparison that stops at the first differing chunk
+    buf_a = bytearray(HASH_CHUNK_SIZE)
+    buf_b = bytearray(HASH_CHUNK_SIZE)
+    view_a = memoryview(buf_a)
+    view_b = memoryview(buf_b)
+    try:
+        with open(filepath_a, 'rb', buffering=0) as file_a, open(filepath_b, 'rb', buffering=0) as file_b:
+            advise_file(file_a.fileno(), 'POSIX_FADV_SEQUENTIAL')
+            advise_file(file_b.fileno(), 'POSIX_FADV_SEQUENTIAL')
+            while True:
+                length_a = read_chunk(file_a, view_a)
+                length_b = read_chunk(file_b, view_b)
+                if length_a != length_b:
+                    equal = False
+                    break
+                if not length_a:
+                    equal = True  # Both files ended together
+                    break
+                if length_a == HASH_CHUNK_SIZE:
+                    equal = buf_a == buf_b
+                else:
+                    equal = buf_a[:length_a] == buf_b[:length_b]
+                if not equal:
+                    break
+            advise_file(file_a.fileno(), 'POSIX_FADV_DONTNEED')
+            advise_file(file_b.fileno(), 'POSIX_FADV_DONTNEED')
+        return equal
+    except IOError:
+        print(f"Error reading file: {filepath_a} or {filepath_b}")
+        return False
+
+def hash_bytes(data):
+    # One-shot hash for small in-memory reads, where per-call overhead outweighs hashing speed
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    if blake3 is not None:
+        return blake3.blake3(data).hexdigest()
+    return hashlib.sha256(data).hexdigest()
+
+def get_file_prefix_hash(filepath, n=PREFIX_SIZE):
     try:
         with open(filepath, 'rb') as file:
-            buf = file.read(65536)  # Read in 64k chunks
-            while len(buf) > 0:
-                hasher.update(buf)
-                buf = file.read(65536)
-        return hasher.hexdigest()
+            return hash_bytes(file.read(n))
     except IOError:
         print(f"Error reading file: {filepath}")
         return None
 
-def get_file_info(filepath):
+def scan_directory(dir_path, abs_dir_path, current_folder_only, pattern_match, exclude_match):
+    # Lists one directory; returns its matching files as (entry, absolute path), a count of the
+    # files excluded by keyword, and the subdirectories still to scan
+    files = []
+    skipped = 0
+    subdirs = []
+    include_file = should_include_file  # Bound to a local for the per-file loop
     try:
-        stats = os.stat(filepath)
-        return (stats.st_ctime, stats.st_mtime, os.path.abspath(filepath), stats.st_size)
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    if pattern_match is not None and not pattern_match(entry.name):
+                        continue
+                    if include_file(entry.path, exclude_match):
+                        try:
+                            entry.stat()  # DirEntry caches this, so the stat happens here rather than on the main thread
+                        except OSError:
+                            pass
+                        files.append((entry, os.path.join(abs_dir_path, entry.name)))
+                    else:
+                        skipped += 1
+                elif not current_folder_only and not entry.is_symlink():
+                    subdirs.append((entry.path, os.path.join(abs_dir_path, entry.name)))
     except OSError:
-        print(f"Error accessing file: {filepath}")
+        pass  # Skip unreadable directories, like os.walk does
+    return files, skipped, subdirs
+
+def scan_files(folder_path, current_folder_only, pattern_match, exclude_match):
+    # Scans directories concurrently so slow metadata reads (network mounts, cold disks) overlap;
+    # yields (files, skipped) for each directory, in breadth-first order
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=hash_worker_count(folder_path)) as executor:
+        # Results are taken in submission order so file ids, and every report, are the same on each run;
+        # later directories keep scanning in the background while the main thread waits on earlier ones
+        pending = deque([executor.submit(scan_directory, folder_path, os.path.abspath(folder_path), current_folder_only, pattern_match, exclude_match)])
+        while pending:
+            files, skipped, subdirs = pending.popleft().result()
+            for dir_path, abs_dir_path in subdirs:
+                pending.append(executor.submit(scan_directory, dir_path, abs_dir_path, current_folder_only, pattern_match, exclude_match))
+            yield files, skipped
+
+def compile_file_pattern(file_pattern):
+    # Translate the glob once; returns None when every filename matches
+    if file_pattern == '*':
         return None
+    # fnmatch.fnmatch is case-insensitive wherever os.path.normcase folds case (Windows)
+    flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+    return re.compile(fnmatch.translate(file_pattern), flags).match
 
-def should_include_file(filepath, exclude_keywords):
-    return not any(keyword.lower() in filepath.lower() for keyword in exclude_keywords)
+def compile_exclude_keywords(exclude_keywords):
+    # Returns a function reporting whether a lowercased path contains any of the (lowercase)
+    # keywords, or None if there are none
+    if not exclude_keywords:
+        return None
+    if len(exclude_keywords) == 1:
+        keyword = exclude_keywords[0]
+        return lambda path: keyword in path
+    if ahocorasick is not None:
+        # Aho-Corasick finds any of the keywords in a single pass over the path
+        automaton = ahocorasick.Automaton()
+        for keyword in exclude_keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda path: next(automaton.iter(path), None) is not None
+    keyword_search = re.compile('|'.join(re.escape(keyword) for keyword in exclude_keywords)).search
+    return lambda path: keyword_search(path) is not None
+
+def should_include_file(filepath, exclude_match):
+    return exclude_match is None or not exclude_match(filepath.lower())
 
 def format_date(timestamp):
-    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+    # Dates only show whole seconds, and sibling files often share them, so format each second once
+    return format_whole_seconds(int(timestamp // 1))
+
+@lru_cache(maxsize=65536)
+def format_whole_seconds(seconds):
+    return datetime.fromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
 
 def parse_size(size_str):
     if not size_str:
@@ -103,119 +339,258 @@ def parse_size(size_str):
         print(f"Invalid size format: {size_str}. Using default of 0 bytes.")
         return 0
 
-def find_duplicates(folder_path, file_pattern, current_folder_only, check_contents, verbose, exclude_keywords, min_filesize):
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    from tqdm import tqdm
+def is_rotational(path):
+    # Look up the block device behind path in sysfs (Linux only); assume solid state when unknown
+    try:
+        dev = os.stat(path).st_dev
+        block = os.path.realpath(f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}")
+        if not os.path.isdir(os.path.join(block, 'queue')):
+            block = os.path.dirname(block)  # Partitions share their parent disk's queue
+        with open(os.path.join(block, 'queue', 'rotational')) as f:
+            return f.read().strip() == '1'
+    except (OSError, AttributeError):
+        return False
+
+def hash_worker_count(path):
+    if is_rotational(path):
+        return 2  # More concurrent readers just make a spinning disk seek between files
+    return min(32, max(8, os.cpu_count() or 1))
+
+def group_by_hash(executor, hash_func, file_ids, paths, sizes, pbar):
+    from concurrent.futures import as_completed
+
+    file_hashes = defaultdict(list)
+    future_to_file_id = {executor.submit(hash_func, paths[file_id]): file_id for file_id in file_ids}
+    for future in as_completed(future_to_file_id):
+        file_id = future_to_file_id[future]
+        try:
+            file_hash = future.result()
+            if file_hash:
+                file_hashes[(sizes[file_id], file_hash)].append(file_id)
+        except Exception as exc:
+            print(f"Error processing {paths[file_id]}: {exc}")
+        finally:
+            pbar.update(1)
+    return file_hashes
+
+def compare_pairs(executor, pairs, paths, pbar):
+    from concurrent.futures import as_completed
+
+    matches = []
+    future_to_pair = {executor.submit(files_equal, paths[pair[0]], paths[pair[1]]): pair for pair in pairs}
+    for future in as_completed(future_to_pair):
+        pair = future_to_pair[future]
+        try:
+            if future.result():
+                matches.append(pair)
+        except Exception as exc:
+            print(f"Error processing {paths[pair[0]]}: {exc}")
+        finally:
+            pbar.update(len(pair))
+    return matches
 
+def drop_unique_sizes(size_groups, file_table):
+    # Only files that share a size can be duplicates; rebuild the columns without the rest
+    kept_ids = [file_id for group in size_groups.values() if len(group) > 1 for file_id in group]
+    kept_ids.sort()  # Renumber in scan order, so ordering by file id still means ordering by scan position
+    kept_table = tuple(
+        [column[file_id] for file_id in kept_ids] if isinstance(column, list)
+        else array(column.typecode, (column[file_id] for file_id in kept_ids))
+        for column in file_table
+    )
+    kept_groups = defaultdict(list)
+    for file_id, size in enumerate(kept_table[3]):
+        kept_groups[size].append(file_id)
+    return kept_groups, kept_table
+
+def find_duplicates(folder_path, file_pattern, current_folder_only, check_contents, verbose, exclude_keywords, min_filesize, use_mmap=False):
+    # File metadata is kept column-wise and addressed by file id; size_groups maps size -> file ids
+    ctimes = array('d')
+    mtimes = array('d')
+    paths = []
+    sizes = array('q')
     size_groups = defaultdict(list)
     total_files = 0
     excluded_files = 0
     total_size = 0
     
+    pattern_match = compile_file_pattern(file_pattern)
+    exclude_match = compile_exclude_keywords(exclude_keywords)
+    
+    # Bind what the scan loop touches per file to locals
+    add_ctime = ctimes.append
+    add_mtime = mtimes.append
+    add_path = paths.append
+    add_size = sizes.append
+    
     print("Scanning files...")
-    for root, _, files in os.walk(folder_path):
-        if current_folder_only and root != folder_path:
-            continue
-        for filename in files:
-            if fnmatch.fnmatch(filename, file_pattern):
-                filepath = os.path.join(root, filename)
-                if should_include_file(filepath, exclude_keywords):
-                    file_info = get_file_info(filepath)
-                    if file_info and file_info[3] >= min_filesize:
-                        size_groups[file_info[3]].append(file_info)
-                        total_files += 1
-                        total_size += file_info[3]  # file size
-                    else:
-                        excluded_files += 1
-                else:
-                    excluded_files += 1
+    for files, skipped in scan_files(folder_path, current_folder_only, pattern_match, exclude_match):
+        excluded_files += skipped
+        for entry, filepath in files:
+            try:
+                stats = entry.stat()
+            except OSError:
+                print(f"Error accessing file: {entry.path}")
+                excluded_files += 1
+                continue
+            size = stats.st_size
+            if size >= min_filesize:
+                size_groups[size].append(total_files)  # File ids are assigned in scan order
+                add_ctime(stats.st_ctime)
+                add_mtime(stats.st_mtime)
+                add_path(filepath)
+                add_size(size)
+                total_files += 1
+                total_size += size
+            else:
+                excluded_files += 1
     
     print(f"Found {total_files} files to process. Excluded {excluded_files} files based on keywords or size.")
-    duplicates = []
-    duplicate_size = 0
-    
+    # Release unique-size files before hashing; most files in a typical tree have a size of their own
+    size_groups, file_table = drop_unique_sizes(size_groups, (ctimes, mtimes, paths, sizes))
+    return iter_duplicates(size_groups, file_table, check_contents, verbose, folder_path, use_mmap), total_files, total_size
+
+def iter_duplicates(size_groups, file_table, check_contents, verbose, folder_path, use_mmap=False):
+    # Yields (duplicate, original) pairs of (ctime, mtime, path, size) tuples, one at a time
+    # so callers never hold the full list
+    from concurrent.futures import ThreadPoolExecutor
+    from tqdm import tqdm
+
+    ctimes, mtimes, paths, sizes = file_table
+
+    def file_info(file_id):
+        return (ctimes[file_id], mtimes[file_id], paths[file_id], sizes[file_id])
+
+    def age_order(file_id):
+        return (ctimes[file_id], mtimes[file_id], paths[file_id])
+
+    def group_duplicates(group):
+        # The oldest file is the original; min() avoids sorting the whole group
+        original_id = min(group, key=age_order)
+        original = file_info(original_id)
+        for file_id in group:
+            if file_id != original_id:
+                yield file_info(file_id), original
+
     if check_contents:
-        print("Calculating hashes for files with matching sizes...")
-        total_files_to_hash = sum(len(group) for group in size_groups.values() if len(group) > 1)
-        with tqdm(total=total_files_to_hash, unit="file") as pbar:
-            for size, group in size_groups.items():
-                if len(group) > 1:
-                    file_hashes = defaultdict(list)
-                    with ThreadPoolExecutor() as executor:
-                        future_to_filepath = {executor.submit(get_file_hash, file_info[2]): file_info for file_info in group}
-                        for future in as_completed(future_to_filepath):
-                            file_info = future_to_filepath[future]
-                            try:
-                                file_hash = future.result()
-                                if file_hash:
-                                    file_hashes[file_hash].append(file_info)
-                            except Exception as exc:
-                                print(f"Error processing {file_info[2]}: {exc}")
-                            finally:
-                                pbar.update(1)
-                    
-                    for file_hash, hash_group in file_hashes.items():
-                        if len(hash_group) > 1:
-                            sorted_group = sorted(hash_group)
-                            original = sorted_group[0]
-                            duplicates.extend([(filepath, original) for filepath in sorted_group[1:]])
-                            duplicate_size += size * (len(hash_group) - 1)
-                            if verbose:
-                                print(f"Found {len(hash_group)} duplicate files with hash {file_hash[:8]}...")
+        candidates = [file_id for group in size_groups.values() if len(group) > 1 for file_id in group]
+        content_groups = []  # (size, hash, file ids); hash is None for pairs compared byte for byte
+        pairs = []
+        survivors = []
+        # One pool for every size group so small groups don't serialize behind large files,
+        # sized to what the underlying storage can serve in parallel
+        with ThreadPoolExecutor(max_workers=hash_worker_count(folder_path)) as executor:
+            print("Calculating prefix hashes for files with matching sizes...")
+            with tqdm(total=len(candidates), unit="file") as pbar:
+                prefix_hashes = group_by_hash(executor, get_file_prefix_hash, candidates, paths, sizes, pbar)
+            for (size, prefix_hash), prefix_group in prefix_hashes.items():
+                if len(prefix_group) < 2:
+                    continue
+                if size <= PREFIX_SIZE:
+                    content_groups.append((size, prefix_hash, prefix_group))  # The prefix already covers the whole file
+                elif len(prefix_group) == 2:
+                    pairs.append(prefix_group)  # Comparing two files directly skips hashing and can stop early
+                else:
+                    survivors.extend(prefix_group)
+
+            print("Comparing contents of files with matching prefixes...")
+            with tqdm(total=2 * len(pairs) + len(survivors), unit="file") as pbar:
+                for pair in compare_pairs(executor, pairs, paths, pbar):
+                    content_groups.append((sizes[pair[0]], None, pair))
+                for (size, file_hash), hash_group in group_by_hash(executor, partial(get_file_hash, use_mmap=use_mmap), survivors, paths, sizes, pbar).items():
+                    if len(hash_group) > 1:
+                        content_groups.append((size, file_hash, hash_group))
+
+        # Hashes complete in whatever order the pool finishes them; order groups by where their first file was scanned
+        content_groups = [(size, file_hash, sorted(group)) for size, file_hash, group in content_groups]
+        content_groups.sort(key=lambda content_group: content_group[2][0])
+
+        # Report every group before the first pair so verbose lines don't interleave with the listing
+        if verbose:
+            for size, file_hash, hash_group in content_groups:
+                if file_hash is None:
+                    print(f"Found 2 identical files with size {size} bytes")
+                else:
+                    print(f"Found {len(hash_group)} duplicate files with hash {file_hash[:8]}...")
+        for _, _, hash_group in content_groups:
+            yield from group_duplicates(hash_group)
     else:
         print("Checking for size duplicates...")
-        for size, group in size_groups.items():
-            if len(group) > 1:
-                sorted_group = sorted(group)
-                original = sorted_group[0]
-                duplicates.extend([(filepath, original) for filepath in sorted_group[1:]])
-                duplicate_size += size * (len(group) - 1)
-                if verbose:
-                    print(f"Found {len(group)} files with size {size} bytes")
-    
-    return duplicates, total_files, len(duplicates), duplicate_size, total_size
+        duplicate_groups = [(size, group) for size, group in size_groups.items() if len(group) > 1]
+        if verbose:
+            for size, group in duplicate_groups:
+                print(f"Found {len(group)} files with size {size} bytes")
+        for _, group in duplicate_groups:
+            yield from group_duplicates(group)
+
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
 
 def format_size(size):
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024.0:
-            return f"{size:.2f} {unit}"
-        size /= 1024.0
+    # Each unit is 10 more bits, so the bit length picks the unit without looping
+    unit_index = min(len(SIZE_UNITS) - 1, max(0, (int(size).bit_length() - 1) // 10))
+    return f"{size / (1 << (10 * unit_index)):.2f} {SIZE_UNITS[unit_index]}"
 
 def parse_exclude_keywords(exclude_arg):
     if not exclude_arg:
         return []
-    return [keyword.strip() for keyword in exclude_arg.split(',') if keyword.strip()]
-
-def write_csv(duplicates, csv_file):
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Duplicate Filepath', 'Original Filepath', 'Filesize (bytes)', 'Last Modified Date', 'Creation Date'])
-        for duplicate, original in duplicates:
-            dup_ctime, dup_mtime, dup_path, dup_size = duplicate
-            orig_ctime, orig_mtime, orig_path, _ = original
-            writer.writerow([
-                dup_path,
-                orig_path,
-                dup_size,
-                format_date(dup_mtime),
-                format_date(dup_ctime)
-            ])
-
-def write_json(duplicates, json_file):
-    json_data = []
-    for duplicate, original in duplicates:
+    # Matching is case-insensitive, so fold case once here rather than per path
+    return [keyword.strip().lower() for keyword in exclude_arg.split(',') if keyword.strip()]
+
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+def encode_json(record):
+    # orjson and the json fallback produce byte-identical records: compact, with UTF-8 left unescaped
+    if orjson is not None:
+        try:
+            return orjson.dumps(record)
+        except TypeError:
+            pass  # Paths holding surrogate escapes aren't valid UTF-8; escape them as below
+    try:
+        return json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    except UnicodeEncodeError:
+        return json.dumps(record, separators=(',', ':')).encode('utf-8')
+
+def open_text_writer(stack, output_file):
+    f = stack.enter_context(open(output_file, 'w', buffering=OUTPUT_BUFFER_SIZE))
+    def write(duplicate, original):
+        f.write(f"{duplicate[2]}\n")
+    return write
+
+def open_csv_writer(stack, csv_file):
+    writer = csv.writer(stack.enter_context(open(csv_file, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE)))
+    writer.writerow(['Duplicate Filepath', 'Original Filepath', 'Filesize (bytes)', 'Last Modified Date', 'Creation Date'])
+    def write(duplicate, original):
         dup_ctime, dup_mtime, dup_path, dup_size = duplicate
         orig_ctime, orig_mtime, orig_path, _ = original
-        json_data.append({
+        writer.writerow([
+            dup_path,
+            orig_path,
+            dup_size,
+            format_date(dup_mtime),
+            format_date(dup_ctime)
+        ])
+    return write
+
+def open_json_writer(stack, json_file):
+    # Emits the JSON array one record at a time instead of building it in memory
+    f = stack.enter_context(open(json_file, 'wb', buffering=OUTPUT_BUFFER_SIZE))
+    f.write(b'[')
+    stack.callback(f.write, b'\n]\n')  # Runs before the file is closed
+    first = True
+    def write(duplicate, original):
+        nonlocal first
+        dup_ctime, dup_mtime, dup_path, dup_size = duplicate
+        orig_ctime, orig_mtime, orig_path, _ = original
+        f.write(b'\n  ' if first else b',\n  ')
+        first = False
+        f.write(encode_json({
             "Duplicate Filepath": dup_path,
             "Original Filepath": orig_path,
             "Filesize (bytes)": dup_size,
             "Last Modified Date": format_date(dup_mtime),
             "Creation Date": format_date(dup_ctime)
-        })
-    
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, indent=2)
+        }))
+    return write
 
 def main():
     try:
@@ -233,6 +608,7 @@ def main():
         parser.add_argument("--json", help="Specify a JSON file to output detailed duplicate information")
         parser.add_argument("--min-filesize", default="0B", help="Minimum file size to consider (e.g., 10MB, 1GB)")
         parser.add_argument("--quiet", "-q", action="store_true", help="Suppress printing of individual matches")
+        parser.add_argument("--mmap", action="store_true", help="Memory-map large files while hashing (faster, but a file truncated mid-scan stops the run)")
         
         args = parser.parse_args()
 
@@ -249,37 +625,51 @@ def main():
                 print(f"Excluding files with these keywords: {', '.join(exclude_keywords)}")
         
         start_time = time.time()
-        duplicates, total_files, duplicate_count, duplicate_size, total_size = find_duplicates(
-            args.dir, args.pattern, args.current_folder_only, args.check_contents, args.verbose, exclude_keywords, min_filesize
+        duplicates, total_files, total_size = find_duplicates(
+            args.dir, args.pattern, args.current_folder_only, args.check_contents, args.verbose, exclude_keywords, min_filesize, args.mmap
         )
-        end_time = time.time()
-        duration = end_time - start_time
+        duplicate_count = 0
+        duplicate_size = 0
+        report_time = 0.0  # Printing and report writes, kept out of the duplicate check duration
         
-        if duplicates:
-            if not args.quiet:
-                print(f"\nFound {duplicate_count} duplicate files:")
-                for duplicate, original in duplicates:
-                    print(f"{duplicate[2]} ({original[2]})")
-            
-            if args.output:
-                with open(args.output, 'w') as f:
-                    for duplicate, _ in duplicates:
-                        f.write(f"{duplicate[2]}\n")
+        with ExitStack() as stack:
+            writers = []
+            for duplicate, original in duplicates:
+                report_start = time.time()
+                if not duplicate_count:
+                    # Open report files only once there is something to report, so a run without
+                    # duplicates leaves any existing reports untouched
+                    if args.output:
+                        writers.append(open_text_writer(stack, args.output))
+                    if args.csv:
+                        writers.append(open_csv_writer(stack, args.csv))
+                    if args.json:
+                        writers.append(open_json_writer(stack, args.json))
+                    if not args.quiet:
+                        print("\nDuplicate files:")
                 if not args.quiet:
+                    print(f"{duplicate[2]} ({original[2]})")
+                for write in writers:
+                    write(duplicate, original)
+                duplicate_count += 1
+                duplicate_size += duplicate[3]
+                report_time += time.time() - report_start
+            report_start = time.time()  # Closing the report files flushes their buffers
+        report_time += time.time() - report_start
+        
+        end_time = time.time()
+        duration = end_time - start_time - report_time
+        
+        if not args.quiet:
+            if not duplicate_count:
+                print("No duplicates found.")
+            else:
+                if args.output:
                     print(f"\nList of duplicates has been saved to {args.output}")
-            
-            if args.csv:
-                write_csv(duplicates, args.csv)
-                if not args.quiet:
+                if args.csv:
                     print(f"\nDetailed duplicate information has been saved to {args.csv}")
-            
-            if args.json:
-                write_json(duplicates, args.json)
-                if not args.quiet:
+                if args.json:
                     print(f"\nDetailed duplicate information has been saved to {args.json}")
-        else:
-            if not args.quiet:
-                print("No duplicates found.")
         
         print("\nSummary Statistics:")
         print(f"Total files checked: {total_files}")